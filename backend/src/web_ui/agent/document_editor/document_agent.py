@@ -6,17 +6,22 @@ and uses ChromaDB MCP tools for advanced document management.
 """
 
 import asyncio
+import functools
+import hashlib
 import json
 import os
+import time
 import uuid
-from collections.abc import AsyncGenerator
+from collections import OrderedDict, deque
+from collections.abc import AsyncGenerator, Callable
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 
-from langchain.agents import create_react_agent, AgentExecutor
-from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+from langchain.agents import AgentExecutor, create_react_agent
 from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 
 from ...database import (
     ChromaManager,
@@ -24,12 +29,91 @@ from ...database import (
     DocumentPipeline,
     MCPConfigManager,
 )
+from ...database.chroma.documents import DocumentModel
+from ...database.chroma.documents.document_pipeline import SUGGESTION_QUERY_CHARS
 from ...utils import config, llm_provider
 from ...utils.logging_config import get_logger
 from ...utils.mcp_client import setup_mcp_client_and_tools
+from ...utils.paths import get_file_extension
 
 logger = get_logger(__name__)
 
+# Default file extension for documents created without one
+EXTENSION_BY_DOCUMENT_TYPE = {
+    "python": ".py",
+    "markdown": ".md",
+    "javascript": ".js",
+    "html": ".html",
+    "json": ".json",
+}
+
+# Bounds for the search/suggestion result cache
+QUERY_CACHE_MAXSIZE = 256
+QUERY_CACHE_TTL = 30.0  # seconds
+
+# Bounds for per-session chat history kept in memory
+MAX_CHAT_HISTORY_MESSAGES = 50
+MAX_CHAT_SESSIONS = 100
+
+# Shared pool for blocking Chroma/pipeline calls, kept off the event loop
+_DB_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="de-db")
+
+# Files read and stored at once by process_batch_documents
+BATCH_CONCURRENCY = 4
+
+# Files above this size are read as raw bytes and decoded in one pass
+LARGE_FILE_THRESHOLD = 1 << 20
+
+
+def _read_text_sync(file_path: str) -> str:
+    """Read a UTF-8 text file; open and read share one worker-thread hop."""
+    with open(file_path, encoding="utf-8") as f:
+        if os.fstat(f.fileno()).st_size <= LARGE_FILE_THRESHOLD:
+            return f.read()
+        # Skip the incremental text decoder for large files; translate
+        # newlines afterwards to match what text mode would return
+        content = f.buffer.read().decode("utf-8")
+    if "\r" in content:
+        content = content.replace("\r\n", "\n").replace("\r", "\n")
+    return content
+
+
+def _write_text_sync(file_path: str, content: str) -> None:
+    """Write a UTF-8 text file; open and write share one worker-thread hop."""
+    # Translate newlines up front to match what text mode would write, and
+    # encode once so the threshold is compared against the size in bytes
+    if os.linesep != "\n":
+        content = content.replace("\n", os.linesep)
+    encoded = content.encode("utf-8")
+    if len(encoded) <= LARGE_FILE_THRESHOLD:
+        with open(file_path, "wb") as f:
+            f.write(encoded)
+        return
+
+    # Hand large documents straight to the OS without a buffered copy
+    data = memoryview(encoded)
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+    fd = os.open(file_path, flags, 0o666)
+    try:
+        while data:
+            data = data[os.write(fd, data) :]
+    finally:
+        os.close(fd)
+
+
+def _make_preview(text: str, limit: int = 200) -> str:
+    """Truncate text to a short preview, marking the cut with an ellipsis."""
+    return text if len(text) <= limit else text[:limit] + "..."
+
+
+def _within(path: str, root: str) -> bool:
+    """Check whether an absolute path lies inside an absolute root directory."""
+    try:
+        return os.path.commonpath([path, root]) == root
+    except ValueError:
+        # Different drives on Windows, or mixing absolute and relative paths
+        return False
+
 
 class DocumentEditingAgent:
     """
@@ -59,6 +143,7 @@ class DocumentEditingAgent:
         self.llm = llm
         self.mcp_config_path = mcp_config_path
         self.working_directory = working_directory
+        self._abs_working_dir = os.path.abspath(working_directory)
 
         # LLM configuration
         self.llm_provider_name = llm_provider_name
@@ -68,12 +153,6 @@ class DocumentEditingAgent:
         self.llm_base_url = llm_base_url
         self.llm_kwargs = llm_kwargs
 
-        # Database components
-        self.chroma_manager = ChromaManager()
-        self.document_pipeline = DocumentPipeline()
-        self.database_utils = DatabaseUtils()
-        self.mcp_config_manager = MCPConfigManager(self.document_pipeline)
-
         # MCP client and tools
         self.mcp_client = None
         self.mcp_tools = []
@@ -81,14 +160,68 @@ class DocumentEditingAgent:
 
         # Agent state
         self.current_document_id: str | None = None
+        # Last document stored by create/edit, so callers can reuse it
+        # instead of fetching what was just written back from the database
+        self.current_document: DocumentModel | None = None
         self.session_id = str(uuid.uuid4())
 
+        # The pipeline's content-hash map, version counter and Chroma writes
+        # are not thread-safe, so writes go through the pool one at a time
+        self._pipeline_write_lock = asyncio.Lock()
+
+        # Recent database search/suggestion results, keyed by query
+        self._query_cache: OrderedDict[tuple, tuple[float, Any]] = OrderedDict()
+
+        # Chat history per session, least recently used first
+        self._chat_histories: OrderedDict[str, deque] = OrderedDict()
+
         # Ensure working directory exists
         os.makedirs(working_directory, exist_ok=True)
 
         self.logger = get_logger(__name__)
         self.logger.info(f"DocumentEditingAgent initialized with session: {self.session_id}")
 
+    @functools.cached_property
+    def chroma_manager(self) -> ChromaManager:
+        """Chroma manager, created on first use so startup skips the DB open."""
+        return ChromaManager()
+
+    @functools.cached_property
+    def document_pipeline(self) -> DocumentPipeline:
+        """Document pipeline, created on first use since it sets up collections."""
+        return DocumentPipeline()
+
+    @functools.cached_property
+    def database_utils(self) -> DatabaseUtils:
+        """Database utilities, created on first use."""
+        return DatabaseUtils()
+
+    @functools.cached_property
+    def mcp_config_manager(self) -> MCPConfigManager:
+        """MCP config manager, created on first use."""
+        return MCPConfigManager(self.document_pipeline)
+
+    async def _run_db(self, func: Callable[..., Any], /, *args, **kwargs) -> Any:
+        """Run a blocking database call on the shared database thread pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            _DB_EXECUTOR, functools.partial(func, *args, **kwargs)
+        )
+
+    async def get_stored_document(self, document_id: str) -> DocumentModel | None:
+        """Get a stored document, reusing the one create/edit just wrote."""
+        document = self.current_document
+        if document and document.id == document_id:
+            return document
+        return await self._run_db(
+            self.chroma_manager.get_document, "documents", document_id
+        )
+
+    async def _run_db_write(self, func: Callable[..., Any], /, *args, **kwargs) -> Any:
+        """Run a blocking pipeline write, serialized with every other write."""
+        async with self._pipeline_write_lock:
+            return await self._run_db(func, *args, **kwargs)
+
     async def initialize(self) -> bool:
         """Initialize MCP client, tools, and LLM if needed."""
         try:
@@ -248,15 +381,17 @@ class DocumentEditingAgent:
 
                 self.mcp_config_path = str(get_project_root() / "data" / "mcp.json")
 
-            if os.path.exists(self.mcp_config_path):
-                with open(self.mcp_config_path) as f:
-                    config_data = json.load(f)
-                    self.logger.info(
-                        f"Loaded MCP configuration from file: {self.mcp_config_path}"
-                    )
-                    return config_data
+            try:
+                config_data = json.loads(
+                    await asyncio.to_thread(_read_text_sync, self.mcp_config_path)
+                )
+            except FileNotFoundError:
+                return None
 
-            return None
+            self.logger.info(
+                f"Loaded MCP configuration from file: {self.mcp_config_path}"
+            )
+            return config_data
 
         except Exception as e:
             self.logger.error(f"Error loading MCP configuration: {e}")
@@ -271,31 +406,29 @@ class DocumentEditingAgent:
     ) -> tuple[bool, str, str | None]:
         """Create a new document with database persistence."""
         try:
-            file_path = os.path.join(self.working_directory, filename)
-
             # Ensure file has appropriate extension
-            if not Path(filename).suffix:
-                extension_map = {
-                    "python": ".py",
-                    "markdown": ".md",
-                    "javascript": ".js",
-                    "html": ".html",
-                    "json": ".json",
-                }
-                filename += extension_map.get(document_type, ".txt")
-                file_path = os.path.join(self.working_directory, filename)
+            if not get_file_extension(filename):
+                filename += EXTENSION_BY_DOCUMENT_TYPE.get(document_type, ".txt")
+
+            file_path = os.path.abspath(os.path.join(self._abs_working_dir, filename))
+            if not _within(file_path, self._abs_working_dir):
+                return (
+                    False,
+                    f"Access denied: {filename} is outside the working directory",
+                    None,
+                )
 
             # Create template content if empty
             if not content:
                 content = await self._generate_template_content(document_type, filename)
 
             # Save file
-            with open(file_path, "w", encoding="utf-8") as f:
-                f.write(content)
+            await asyncio.to_thread(_write_text_sync, file_path, content)
 
             # Store in database
             success, message, doc_model = (
-                self.document_pipeline.process_document_from_editor(
+                await self._run_db_write(
+                    self.document_pipeline.process_document_from_editor,
                     content=content,
                     file_path=file_path,
                     document_type=document_type,
@@ -310,7 +443,9 @@ class DocumentEditingAgent:
             )
 
             if success and doc_model:
+                self._query_cache.clear()
                 self.current_document_id = doc_model.id
+                self.current_document = doc_model
                 self.logger.info(f"Document created successfully: {filename}")
                 return True, f"Document created: {filename}", doc_model.id
             else:
@@ -326,7 +461,9 @@ class DocumentEditingAgent:
         """Edit a document using AI assistance and MCP tools."""
         try:
             # Get document from database
-            document = self.chroma_manager.get_document("documents", document_id)
+            document = await self._run_db(
+                self.chroma_manager.get_document, "documents", document_id
+            )
             if not document:
                 return False, f"Document not found: {document_id}", None
 
@@ -364,12 +501,12 @@ class DocumentEditingAgent:
                 # Update file on disk
                 file_path = document.metadata.get("file_path")
                 if file_path and os.path.exists(file_path):
-                    with open(file_path, "w", encoding="utf-8") as f:
-                        f.write(new_content)
+                    await asyncio.to_thread(_write_text_sync, file_path, new_content)
 
                 # Update in database
                 success, message, doc_model = (
-                    self.document_pipeline.process_document_from_editor(
+                    await self._run_db_write(
+                        self.document_pipeline.process_document_from_editor,
                         content=new_content,
                         file_path=file_path
                         or f"{self.working_directory}/updated_{document_id}.txt",
@@ -387,6 +524,9 @@ class DocumentEditingAgent:
                 )
 
                 if success:
+                    self._query_cache.clear()
+                    if doc_model:
+                        self.current_document = doc_model
                     return (
                         True,
                         "Document edited successfully",
@@ -446,10 +586,13 @@ Provide the edited content:"""
                 new_content = str(response).strip()
 
             # Clean up response (remove markdown code blocks if present)
+            # by slicing between the opening line and the closing fence,
+            # without splitting the whole response into lines
             if new_content.startswith("```"):
-                lines = new_content.split("\n")
-                if len(lines) > 2:
-                    new_content = "\n".join(lines[1:-1])
+                first_newline = new_content.find("\n")
+                closing_fence = new_content.rfind("\n```")
+                if first_newline != -1 and closing_fence > first_newline:
+                    new_content = new_content[first_newline + 1 : closing_fence]
 
             return new_content
 
@@ -486,13 +629,18 @@ Provide the edited content:"""
         try:
             results = []
 
-            # Search using database pipeline
-            search_results = self.document_pipeline.search_documents(
-                query=query,
-                collection_type=collection_type,
-                include_relations=True,
-                limit=limit,
-            )
+            # Search using database pipeline, reusing recent identical queries
+            cache_key = ("search", query, collection_type, limit)
+            search_results = self._get_cached_query(cache_key)
+            if search_results is None:
+                search_results = await self._run_db(
+                    self.document_pipeline.search_documents,
+                    query=query,
+                    collection_type=collection_type,
+                    include_relations=True,
+                    limit=limit,
+                )
+                self._set_cached_query(cache_key, search_results)
 
             # Convert to dict format
             for result in search_results:
@@ -520,6 +668,25 @@ Provide the edited content:"""
             self.logger.error(f"Error searching documents: {e}")
             return []
 
+    def _get_cached_query(self, key: tuple) -> Any | None:
+        """Return a cached database result if it is still fresh."""
+        entry = self._query_cache.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if time.monotonic() >= expires_at:
+            del self._query_cache[key]
+            return None
+        self._query_cache.move_to_end(key)
+        return value
+
+    def _set_cached_query(self, key: tuple, value: Any) -> None:
+        """Cache a database result, evicting the least recently used entry."""
+        self._query_cache[key] = (time.monotonic() + QUERY_CACHE_TTL, value)
+        self._query_cache.move_to_end(key)
+        while len(self._query_cache) > QUERY_CACHE_MAXSIZE:
+            self._query_cache.popitem(last=False)
+
     async def _search_with_mcp_tools(
         self, query: str, limit: int
     ) -> list[dict[str, Any]]:
@@ -571,10 +738,20 @@ Provide the edited content:"""
     ) -> dict[str, list[dict[str, Any]]]:
         """Get intelligent document suggestions."""
         try:
-            # Get suggestions from database pipeline
-            suggestions = self.document_pipeline.get_document_suggestions(
-                content=content, document_type=document_type
-            )
+            # Get suggestions from database pipeline. The pipeline only
+            # queries with the head of the content, so key on a hash of
+            # exactly that: edits further down reuse the cached suggestions
+            content_digest = hashlib.blake2b(
+                content[:SUGGESTION_QUERY_CHARS].encode("utf-8"), digest_size=16
+            ).digest()
+            cache_key = ("suggestions", content_digest, document_type)
+            suggestions = self._get_cached_query(cache_key)
+            if suggestions is None:
+                suggestions = await self._run_db(
+                    self.document_pipeline.get_document_suggestions,
+                    content=content, document_type=document_type
+                )
+                self._set_cached_query(cache_key, suggestions)
 
             # Convert search results to dict format
             formatted_suggestions = {}
@@ -585,9 +762,7 @@ Provide the edited content:"""
                         "title": result.metadata.get(
                             "title", result.metadata.get("filename", "Untitled")
                         ),
-                        "content_preview": result.content[:200] + "..."
-                        if len(result.content) > 200
-                        else result.content,
+                        "content_preview": _make_preview(result.content),
                         "relevance_score": result.relevance_score,
                         "metadata": result.metadata,
                         "source": "database",
@@ -662,12 +837,15 @@ Provide the edited content:"""
         """Store document as a policy manual."""
         try:
             # Get document content
-            document = self.chroma_manager.get_document("documents", document_id)
+            document = await self._run_db(
+                self.chroma_manager.get_document, "documents", document_id
+            )
             if not document:
                 return False, f"Document not found: {document_id}"
 
             # Store as policy
-            success, message = self.document_pipeline.store_policy_manual(
+            success, message = await self._run_db_write(
+                self.document_pipeline.store_policy_manual,
                 title=policy_title,
                 content=document.content,
                 policy_type=policy_type,
@@ -681,6 +859,8 @@ Provide the edited content:"""
                 },
             )
 
+            if success:
+                self._query_cache.clear()
             return success, message
 
         except Exception as e:
@@ -712,13 +892,17 @@ Provide the edited content:"""
         """Get comprehensive database statistics."""
         try:
             # Get collection stats from document pipeline
-            pipeline_stats = self.document_pipeline.get_collection_stats()
+            pipeline_stats = await self._run_db(
+                self.document_pipeline.get_collection_stats
+            )
 
             # Get additional database health info
-            health_info = self.database_utils.health_check()
+            health_info = await self._run_db(self.database_utils.health_check)
 
             # Get MCP config stats
-            mcp_stats = self.mcp_config_manager.get_collection_stats()
+            mcp_stats = await self._run_db(
+                self.mcp_config_manager.get_collection_stats
+            )
 
             return {
                 "pipeline_stats": pipeline_stats,
@@ -778,15 +962,14 @@ Provide the edited content:"""
                 yield "I'm sorry, but the AI agent is not fully configured. Please check the backend logs."
                 return
 
-            # Retrieve chat history for the session
+            # Retrieve chat history for the session; the agent gets the turns
+            # before this one, since the new message is passed as input
             chat_history = self._get_chat_history_for_session(session_id)
-
-            # Append user's message to history
-            chat_history.append(HumanMessage(content=message))
+            prior_history = list(chat_history)
 
             # Prepare input for the agent executor
             full_response_content = ""
-            async for chunk in self.agent_executor.astream({"input": message, "chat_history": chat_history}):
+            async for chunk in self.agent_executor.astream({"input": message, "chat_history": prior_history}):
                 if "output" in chunk:
                     content_chunk = chunk["output"]
                     full_response_content += content_chunk
@@ -802,61 +985,99 @@ Provide the edited content:"""
                         full_response_content += observation_message
                         yield observation_message
 
-            # Append AI's full response to history
+            # Record the exchange once the run has finished
+            chat_history.append(HumanMessage(content=message))
             chat_history.append(AIMessage(content=full_response_content))
 
         except Exception as e:
             self.logger.error(f"Error in streaming chat with agent executor: {e}")
             yield f"I apologize, but I encountered an error: {str(e)}"
 
+    def _get_chat_history_for_session(self, session_id: str) -> deque:
+        """Get the bounded message history for a chat session."""
+        history = self._chat_histories.get(session_id)
+        if history is None:
+            # Old messages fall off the deque on append; idle sessions are
+            # evicted oldest first once the session cap is reached
+            history = deque(maxlen=MAX_CHAT_HISTORY_MESSAGES)
+            self._chat_histories[session_id] = history
+            while len(self._chat_histories) > MAX_CHAT_SESSIONS:
+                self._chat_histories.popitem(last=False)
+        else:
+            self._chat_histories.move_to_end(session_id)
+        return history
+
     async def process_batch_documents(
         self, file_paths: list[str], document_type: str = "document"
     ) -> dict[str, Any]:
         """Process multiple documents in batch."""
         try:
-            results = {"processed": [], "failed": [], "total": len(file_paths)}
+            # Coalesce repeated paths so each file is read and stored once;
+            # total still counts every requested path
+            unique_paths = list(dict.fromkeys(file_paths))
+            results = {
+                "processed": [],
+                "failed": [],
+                "total": len(file_paths),
+                "duplicates": len(file_paths) - len(unique_paths),
+            }
 
-            for file_path in file_paths:
-                try:
-                    if os.path.exists(file_path):
-                        with open(file_path, encoding="utf-8") as f:
-                            content = f.read()
-
-                        success, message, doc_model = (
-                            self.document_pipeline.process_document_from_editor(
-                                content=content,
-                                file_path=file_path,
-                                document_type=document_type,
-                                metadata={
-                                    "batch_processed": True,
-                                    "agent_session": self.session_id,
-                                    "processed_at": datetime.now().isoformat(),
-                                    "llm_provider": self.llm_provider_name,
-                                },
+            # Each file is read and stored before its slot is released, so at
+            # most BATCH_CONCURRENCY documents are held in memory at once.
+            # Reads overlap; the stores are serialized by _run_db_write
+            semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+
+            async def process_file(file_path: str) -> tuple[str, dict[str, Any]]:
+                async with semaphore:
+                    try:
+                        # Read directly; a missing file surfaces as
+                        # FileNotFoundError instead of paying for a separate
+                        # exists() stat first
+                        try:
+                            content = await asyncio.to_thread(
+                                _read_text_sync, file_path
                             )
+                        except FileNotFoundError:
+                            return "failed", {
+                                "file_path": file_path,
+                                "error": "File not found",
+                            }
+
+                        success, message, doc_model = await self._run_db_write(
+                            self.document_pipeline.process_document_from_editor,
+                            content=content,
+                            file_path=file_path,
+                            document_type=document_type,
+                            metadata={
+                                "batch_processed": True,
+                                "agent_session": self.session_id,
+                                "processed_at": datetime.now().isoformat(),
+                                "llm_provider": self.llm_provider_name,
+                            },
                         )
 
                         if success and doc_model:
-                            results["processed"].append(
-                                {
-                                    "file_path": file_path,
-                                    "document_id": doc_model.id,
-                                    "message": message,
-                                }
-                            )
-                        else:
-                            results["failed"].append(
-                                {"file_path": file_path, "error": message}
-                            )
-                    else:
-                        results["failed"].append(
-                            {"file_path": file_path, "error": "File not found"}
-                        )
+                            return "processed", {
+                                "file_path": file_path,
+                                "document_id": doc_model.id,
+                                "message": message,
+                            }
+                        return "failed", {"file_path": file_path, "error": message}
 
-                except Exception as file_error:
-                    results["failed"].append(
-                        {"file_path": file_path, "error": str(file_error)}
-                    )
+                    except Exception as file_error:
+                        return "failed", {
+                            "file_path": file_path,
+                            "error": str(file_error),
+                        }
+
+            # gather keeps the input order, so results stay in first-seen order
+            for outcome, entry in await asyncio.gather(
+                *(process_file(path) for path in unique_paths)
+            ):
+                results[outcome].append(entry)
+
+            if results["processed"]:
+                self._query_cache.clear()
 
             self.logger.info(
                 f"Batch processing completed: {len(results['processed'])} processed, {len(results['failed'])} failed"
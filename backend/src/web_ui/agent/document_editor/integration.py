@@ -15,6 +15,14 @@ from .document_agent import DocumentEditingAgent
 
 logger = get_logger(__name__)
 
+# Markdown headings for the search and suggestion panels
+SEARCH_RESULTS_HEADER = "**🔍 Enhanced Search Results**\n\n"
+SUGGESTIONS_HEADER = "**💡 Enhanced Document Suggestions**\n\n"
+RELATED_POLICIES_HEADER = "**📋 Related Policies:**\n"
+SIMILAR_DOCUMENTS_HEADER = "**📄 Similar Documents:**\n"
+TEMPLATES_HEADER = "**📋 Available Templates:**\n"
+MCP_SUGGESTIONS_HEADER = "**🔧 MCP Tool Suggestions:**\n"
+
 
 class DocumentEditorIntegration:
     """Integration layer between DocumentEditingAgent and document editor UI."""
@@ -24,6 +32,7 @@ class DocumentEditorIntegration:
         self.webui_manager = webui_manager
         self.agent: DocumentEditingAgent | None = None
         self._initialization_task = None
+        self._components: dict[str, Any] = {}
 
     async def initialize_agent(
         self,
@@ -103,17 +112,13 @@ class DocumentEditorIntegration:
                 return {}, "DocumentEditingAgent not available"
 
             # Get current content and file
-            editor_comp = webui_manager.get_component_by_id("document_editor.editor")
+            editor_comp = self.get_component("editor")
             current_content = components.get(editor_comp, "")
 
-            file_path_comp = webui_manager.get_component_by_id(
-                "document_editor.current_file_path"
-            )
+            file_path_comp = self.get_component("current_file_path")
             current_file = components.get(file_path_comp, "")
 
-            agent_instruction_comp = webui_manager.get_component_by_id(
-                "document_editor.agent_instruction"
-            )
+            agent_instruction_comp = self.get_component("agent_instruction")
             instruction = components.get(agent_instruction_comp, "").strip()
 
             if not instruction:
@@ -166,8 +171,8 @@ class DocumentEditorIntegration:
 
                 if success:
                     # Get the updated content
-                    updated_doc = self.agent.chroma_manager.get_document(
-                        "documents", updated_doc_id or document_id
+                    updated_doc = await self.agent.get_stored_document(
+                        updated_doc_id or document_id
                     )
                     if updated_doc:
                         language = (
@@ -178,9 +183,7 @@ class DocumentEditorIntegration:
                             else "text"
                         )
 
-                        status_comp = webui_manager.get_component_by_id(
-                            "document_editor.status"
-                        )
+                        status_comp = self.get_component("status")
 
                         return {
                             editor_comp: gr.Code(
@@ -202,6 +205,16 @@ class DocumentEditorIntegration:
             logger.error(f"Error in enhanced agent edit: {e}")
             return {}, f"Error in agent edit: {str(e)}"
 
+    def get_component(self, component_id: str) -> Any:
+        """Get a document editor component, caching the manager lookup."""
+        component = self._components.get(component_id)
+        if component is None:
+            component = self.webui_manager.get_component_by_id(
+                f"document_editor.{component_id}"
+            )
+            self._components[component_id] = component
+        return component
+
     async def enhanced_document_search(
         self,
         search_query: str,
@@ -219,7 +232,10 @@ class DocumentEditorIntegration:
                     "Agent not available",
                 )
 
-            if not search_query.strip():
+            # Collapse whitespace so queries that differ only in spacing share
+            # the agent's cached search results
+            search_query = " ".join(search_query.split())
+            if not search_query:
                 return (
                     "**Search Results**\n\n*Please enter a search query*",
                     "Empty query",
@@ -235,7 +251,7 @@ class DocumentEditorIntegration:
 
             # Format results
             if results:
-                results_md = "**🔍 Enhanced Search Results**\n\n"
+                parts = [SEARCH_RESULTS_HEADER]
                 for i, result in enumerate(results[:8], 1):
                     title = result.get("metadata", {}).get(
                         "filename", result.get("id", "Unknown")
@@ -243,18 +259,21 @@ class DocumentEditorIntegration:
                     score = f"{result.get('relevance_score', 0):.3f}"
                     source = result.get("source", "database")
 
-                    results_md += (
+                    parts.append(
                         f"{i}. **{title}** (Score: {score}, Source: {source})\n"
                     )
 
                     content_preview = result.get("content", "")
                     if len(content_preview) > 150:
                         content_preview = content_preview[:150] + "..."
-                    results_md += f"   *{content_preview}*\n\n"
+                    parts.append(f"   *{content_preview}*\n\n")
 
+                results_md = "".join(parts)
                 message = f"Found {len(results)} documents using enhanced search"
             else:
-                results_md = "**🔍 Enhanced Search Results**\n\n*No documents found matching your query.*"
+                results_md = (
+                    SEARCH_RESULTS_HEADER + "*No documents found matching your query.*"
+                )
                 message = "No results found"
 
             return results_md, message
@@ -293,46 +312,48 @@ class DocumentEditorIntegration:
             )
 
             # Format suggestions
-            suggestions_md = "**💡 Enhanced Document Suggestions**\n\n"
+            parts = [SUGGESTIONS_HEADER]
 
             # Database suggestions
             if suggestions.get("related_policies"):
-                suggestions_md += "**📋 Related Policies:**\n"
+                parts.append(RELATED_POLICIES_HEADER)
                 for policy in suggestions["related_policies"][:3]:
                     title = policy["title"]
                     score = f"{policy['relevance_score']:.3f}"
-                    suggestions_md += f"• **{title}** (Score: {score})\n"
-                    suggestions_md += f"  *{policy['content_preview']}*\n\n"
+                    parts.append(f"• **{title}** (Score: {score})\n")
+                    parts.append(f"  *{policy['content_preview']}*\n\n")
 
             if suggestions.get("similar_documents"):
-                suggestions_md += "**📄 Similar Documents:**\n"
+                parts.append(SIMILAR_DOCUMENTS_HEADER)
                 for doc in suggestions["similar_documents"][:3]:
                     title = doc["title"]
                     score = f"{doc['relevance_score']:.3f}"
-                    suggestions_md += f"• **{title}** (Score: {score})\n"
-                    suggestions_md += f"  *{doc['content_preview']}*\n\n"
+                    parts.append(f"• **{title}** (Score: {score})\n")
+                    parts.append(f"  *{doc['content_preview']}*\n\n")
 
             if suggestions.get("templates"):
-                suggestions_md += "**📋 Available Templates:**\n"
+                parts.append(TEMPLATES_HEADER)
                 for template in suggestions["templates"][:2]:
                     title = template["title"]
-                    suggestions_md += f"• **{title}**\n"
-                    suggestions_md += f"  *{template['content_preview']}*\n\n"
+                    parts.append(f"• **{title}**\n")
+                    parts.append(f"  *{template['content_preview']}*\n\n")
 
             # MCP suggestions
             if suggestions.get("mcp_suggestions"):
-                suggestions_md += "**🔧 MCP Tool Suggestions:**\n"
+                parts.append(MCP_SUGGESTIONS_HEADER)
                 for mcp_suggestion in suggestions["mcp_suggestions"][:2]:
                     title = mcp_suggestion.get("title", "MCP Suggestion")
-                    suggestions_md += f"• **{title}**\n"
+                    parts.append(f"• **{title}**\n")
                     if "description" in mcp_suggestion:
-                        suggestions_md += f"  *{mcp_suggestion['description']}*\n\n"
+                        parts.append(f"  *{mcp_suggestion['description']}*\n\n")
 
             if not any(suggestions.values()):
-                suggestions_md += (
+                parts.append(
                     "*No suggestions available. Try saving some documents first.*"
                 )
 
+            suggestions_md = "".join(parts)
+
             total_suggestions = sum(len(v) for v in suggestions.values())
             message = f"Generated {total_suggestions} enhanced suggestions"
 
@@ -363,24 +384,16 @@ class DocumentEditorIntegration:
 
             if success and document_id:
                 # Get the created document
-                document = self.agent.chroma_manager.get_document(
-                    "documents", document_id
-                )
+                document = await self.agent.get_stored_document(document_id)
                 if document:
                     file_path = document.metadata.get("file_path", "")
                     language = self.webui_manager.de_manager.get_file_language(
                         file_path
                     )
 
-                    editor_comp = self.webui_manager.get_component_by_id(
-                        "document_editor.editor"
-                    )
-                    file_path_comp = self.webui_manager.get_component_by_id(
-                        "document_editor.current_file_path"
-                    )
-                    status_comp = self.webui_manager.get_component_by_id(
-                        "document_editor.status"
-                    )
+                    editor_comp = self.get_component("editor")
+                    file_path_comp = self.get_component("current_file_path")
+                    status_comp = self.get_component("status")
 
                     return {
                         editor_comp: gr.Code(
@@ -445,39 +458,39 @@ class DocumentEditorIntegration:
 # Integration helper functions for backward compatibility with existing document_editor_tab.py
 
 
-async def enhanced_agent_edit_handler(
-    webui_manager: WebuiManager, components: dict[gr.components.Component, Any]
-):
-    """Enhanced version of handle_agent_edit that uses DocumentEditingAgent."""
+async def _get_integration(
+    webui_manager: WebuiManager, llm: Any | None = None
+) -> DocumentEditorIntegration:
+    """Get the manager's integration, creating and initializing it on first use."""
     integration = getattr(webui_manager, "_doc_agent_integration", None)
 
     if not integration:
-        # Initialize integration on first use
         integration = DocumentEditorIntegration(webui_manager)
         webui_manager._doc_agent_integration = integration
-
-        # Initialize with LLM from webui manager if available
-        llm = getattr(webui_manager, "llm", None)
         await integration.initialize_agent(llm=llm)
 
+    return integration
+
+
+async def enhanced_agent_edit_handler(
+    webui_manager: WebuiManager, components: dict[gr.components.Component, Any]
+):
+    """Enhanced version of handle_agent_edit that uses DocumentEditingAgent."""
+    # Initialize with LLM from webui manager if available
+    integration = await _get_integration(
+        webui_manager, llm=getattr(webui_manager, "llm", None)
+    )
     return await integration.enhanced_agent_edit(webui_manager, components)
 
 
 async def enhanced_search_handler(webui_manager: WebuiManager, search_query: str):
     """Enhanced version of handle_search_documents that uses DocumentEditingAgent."""
-    integration = getattr(webui_manager, "_doc_agent_integration", None)
-
-    if not integration:
-        integration = DocumentEditorIntegration(webui_manager)
-        webui_manager._doc_agent_integration = integration
-        await integration.initialize_agent()
+    integration = await _get_integration(webui_manager)
 
     results_md, message = await integration.enhanced_document_search(search_query)
 
-    search_results_comp = webui_manager.get_component_by_id(
-        "document_editor.search_results"
-    )
-    status_comp = webui_manager.get_component_by_id("document_editor.status")
+    search_results_comp = integration.get_component("search_results")
+    status_comp = integration.get_component("status")
 
     return {
         search_results_comp: gr.Markdown(value=results_md),
@@ -489,21 +502,14 @@ async def enhanced_suggestions_handler(
     webui_manager: WebuiManager, content: str, current_file: str
 ):
     """Enhanced version of handle_get_suggestions that uses DocumentEditingAgent."""
-    integration = getattr(webui_manager, "_doc_agent_integration", None)
-
-    if not integration:
-        integration = DocumentEditorIntegration(webui_manager)
-        webui_manager._doc_agent_integration = integration
-        await integration.initialize_agent()
+    integration = await _get_integration(webui_manager)
 
     suggestions_md, message = await integration.enhanced_get_suggestions(
         content, current_file
     )
 
-    suggestions_comp = webui_manager.get_component_by_id(
-        "document_editor.suggestions_display"
-    )
-    status_comp = webui_manager.get_component_by_id("document_editor.status")
+    suggestions_comp = integration.get_component("suggestions_display")
+    status_comp = integration.get_component("status")
 
     return {
         suggestions_comp: gr.Markdown(value=suggestions_md),
@@ -58,12 +58,12 @@ class UserLogin(BaseModel):
 
 def create_access_token(data: dict, expires_delta: timedelta | None = None):
     """Create JWT access token."""
-    to_encode = data.copy()
     if expires_delta:
         expire = datetime.now(UTC) + expires_delta
     else:
         expire = datetime.now(UTC) + timedelta(minutes=15)
-    to_encode.update({"exp": expire})
+    # Build the claims in one literal instead of copy() plus update()
+    to_encode = {**data, "exp": expire}
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
@@ -1,17 +1,52 @@
 """Document pipeline for integrating document editor with ChromaDB."""
 
 import hashlib
+import itertools
+import os
+import time
+from collections import OrderedDict
 from datetime import datetime
-from pathlib import Path
 from typing import Any
 
 from web_ui.utils.logging_config import get_logger
+from web_ui.utils.paths import get_file_extension
 from .chroma_manager import ChromaManager
 from .models import DocumentModel, QueryRequest, SearchResult
 from ...utils.utils import DatabaseUtils
 
 logger = get_logger(__name__)
 
+# Programming/markup language by file extension
+LANGUAGE_BY_EXTENSION = {
+    ".py": "python",
+    ".js": "javascript",
+    ".ts": "typescript",
+    ".html": "html",
+    ".css": "css",
+    ".md": "markdown",
+    ".json": "json",
+    ".xml": "xml",
+    ".yaml": "yaml",
+    ".yml": "yaml",
+    ".sql": "sql",
+    ".sh": "shell",
+    ".bat": "batch",
+    ".ps1": "powershell",
+    ".txt": "text",
+}
+
+
+# Leading characters of a document used as the query for suggestions
+SUGGESTION_QUERY_CHARS = 500
+
+# File paths whose last indexed content hash is remembered
+CONTENT_HASH_CACHE_MAXSIZE = 1024
+
+
+def get_file_language(file_path: str) -> str:
+    """Get the programming/markup language for a file path from its extension."""
+    return LANGUAGE_BY_EXTENSION.get(get_file_extension(file_path), "text")
+
 
 class DocumentPipeline:
     """Pipeline for processing documents from editor to database."""
@@ -21,6 +56,14 @@ class DocumentPipeline:
         self.manager = ChromaManager()
         self.utils = DatabaseUtils()
 
+        # Content hash last indexed per absolute file path, least recently
+        # saved first, used to skip re-indexing and versioning when a save
+        # does not change the content
+        self._last_content_hash: OrderedDict[str, str] = OrderedDict()
+
+        # Disambiguates version ids created within the same clock tick
+        self._version_counter = itertools.count()
+
         # Initialize specialized collections
         self._setup_document_collections()
 
@@ -92,8 +135,8 @@ class DocumentPipeline:
         """Process a document from the editor and store in database."""
         try:
             # Extract document information
-            filename = Path(file_path).name
-            file_extension = Path(file_path).suffix.lower()
+            filename = os.path.basename(file_path)
+            file_extension = get_file_extension(file_path)
 
             # Generate document ID based on content hash
             content_hash = hashlib.sha256(content.encode("utf-8")).hexdigest()[:16]
@@ -108,7 +151,7 @@ class DocumentPipeline:
                 "content_hash": content_hash,
                 "word_count": len(content.split()),
                 "character_count": len(content),
-                "language": self._detect_language_from_extension(file_extension),
+                "language": get_file_language(file_path),
                 "processed_at": datetime.now().isoformat(),
                 **(metadata or {}),
             }
@@ -127,12 +170,29 @@ class DocumentPipeline:
             if not success:
                 return False, "Failed to store document in main collection", None
 
+            # Chunks and versions only change with the content; the main
+            # document is still upserted above so its metadata stays current
+            hash_key = os.path.abspath(file_path) if file_path else None
+            if hash_key and self._last_content_hash.get(hash_key) == content_hash:
+                self._last_content_hash.move_to_end(hash_key)
+                logger.debug(f"Content unchanged, skipping re-index: {doc_id}")
+                return True, f"Document stored successfully: {filename}", document
+
             # Process for vector search if content is substantial
+            indexed = True
             if len(content) > 100:  # Only chunk substantial content
-                self._process_for_vector_search(document)
+                indexed = self._process_for_vector_search(document)
 
             # Store version history
-            self._store_document_version(document)
+            versioned = self._store_document_version(document)
+
+            # Only remember the hash once both succeeded, so a failed save is
+            # retried on the next save with the same content
+            if hash_key and indexed and versioned:
+                self._last_content_hash[hash_key] = content_hash
+                self._last_content_hash.move_to_end(hash_key)
+                while len(self._last_content_hash) > CONTENT_HASH_CACHE_MAXSIZE:
+                    self._last_content_hash.popitem(last=False)
 
             logger.info(f"Successfully processed document: {doc_id}")
             return True, f"Document stored successfully: {filename}", document
@@ -141,29 +201,11 @@ class DocumentPipeline:
             logger.error(f"Error processing document from editor: {e}")
             return False, f"Error processing document: {str(e)}", None
 
-    def _detect_language_from_extension(self, extension: str) -> str:
-        """Detect programming/markup language from file extension."""
-        language_map = {
-            ".py": "python",
-            ".js": "javascript",
-            ".ts": "typescript",
-            ".html": "html",
-            ".css": "css",
-            ".md": "markdown",
-            ".json": "json",
-            ".xml": "xml",
-            ".yaml": "yaml",
-            ".yml": "yaml",
-            ".sql": "sql",
-            ".sh": "shell",
-            ".bat": "batch",
-            ".ps1": "powershell",
-            ".txt": "text",
-        }
-        return language_map.get(extension, "text")
-
-    def _process_for_vector_search(self, document: DocumentModel):
-        """Process document for optimized vector search."""
+    def _process_for_vector_search(self, document: DocumentModel) -> bool:
+        """Process document for optimized vector search.
+
+        Returns True if every chunk was stored.
+        """
         try:
             # Chunk the document content for better search
             chunks = self._chunk_content(document.content)
@@ -186,12 +228,17 @@ class DocumentPipeline:
                     timestamp=document.timestamp,
                 )
 
-                self.manager.add_document("document_vectors", chunk_doc)
+                stored = self.manager.add_document("document_vectors", chunk_doc)
+                if not stored:
+                    logger.error(f"Failed to store chunk {chunk_id}")
+                    return False
 
             logger.debug(f"Created {len(chunks)} chunks for document {document.id}")
+            return True
 
         except Exception as e:
             logger.error(f"Error processing document for vector search: {e}")
+            return False
 
     def _chunk_content(
         self, content: str, chunk_size: int = 512, overlap: int = 50
@@ -214,10 +261,18 @@ class DocumentPipeline:
 
         return chunks
 
-    def _store_document_version(self, document: DocumentModel):
-        """Store document version for history tracking."""
+    def _store_document_version(self, document: DocumentModel) -> bool:
+        """Store document version for history tracking.
+
+        Returns True if the version was stored.
+        """
         try:
-            version_id = f"{document.id}_v_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+            # Second-resolution timestamps let two saves in the same second
+            # overwrite each other's version; the save time is kept on the
+            # version's timestamp field
+            version_id = (
+                f"{document.id}_v_{time.time_ns()}_{next(self._version_counter)}"
+            )
             version_metadata = {
                 **document.metadata,
                 "parent_document_id": document.id,
@@ -233,10 +288,11 @@ class DocumentPipeline:
                 timestamp=document.timestamp,
             )
 
-            self.manager.add_document("document_versions", version_doc)
+            return self.manager.add_document("document_versions", version_doc)
 
         except Exception as e:
             logger.error(f"Error storing document version: {e}")
+            return False
 
     def store_policy_manual(
         self,
@@ -423,8 +479,9 @@ class DocumentPipeline:
             suggestions = {}
 
             # Search for related policies
+            query = content[:SUGGESTION_QUERY_CHARS]
             policy_results = self.search_documents(
-                query=content[:500],  # Use first 500 chars for search
+                query=query,
                 collection_type="policies",
                 limit=5,
             )
@@ -432,7 +489,7 @@ class DocumentPipeline:
 
             # Search for similar documents
             similar_docs = self.search_documents(
-                query=content[:500], collection_type="vectors", limit=5
+                query=query, collection_type="vectors", limit=5
             )
             suggestions["similar_documents"] = similar_docs
 
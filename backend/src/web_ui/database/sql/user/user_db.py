@@ -79,6 +79,18 @@ class UserDatabase:
         logger.info(f"Successfully created user {user.id} with email {email}.")
         return user
 
+    def create_users(self, db: Session, users: list[dict[str, Any]]) -> list[User]:
+        """Create several users in one commit from pre-hashed field dicts."""
+        logger.info(f"Attempting to create {len(users)} users in one batch")
+        created_at = datetime.now(UTC).isoformat()
+        new_users = [
+            User(id=str(uuid4()), created_at=created_at, **fields) for fields in users
+        ]
+        db.add_all(new_users)
+        db.commit()
+        logger.info(f"Successfully created {len(new_users)} users.")
+        return new_users
+
     def get_user_by_email(self, db: Session, email: str) -> User | None:
         logger.debug(f"Querying for user with email: {email}")
         user = db.query(User).filter(User.email == email).first()
@@ -168,6 +180,28 @@ class UserDatabase:
         logger.warning(f"Authentication failed for email: {email}")
         return None
 
+    def delete_users_by_emails(self, emails: list[str]) -> int:
+        """Delete users (and their state) by email in a single transaction."""
+        if not emails:
+            return 0
+        try:
+            with self.get_session() as db:
+                user_ids = db.query(User.id).filter(User.email.in_(emails))
+                db.query(UserState).filter(UserState.user_id.in_(user_ids)).delete(
+                    synchronize_session=False
+                )
+                count = (
+                    db.query(User)
+                    .filter(User.email.in_(emails))
+                    .delete(synchronize_session=False)
+                )
+                db.commit()
+                logger.info(f"Deleted {count} users by email")
+                return count
+        except Exception as e:
+            logger.error(f"Error deleting users by email: {e}")
+            return 0
+
     def clear_all_users(self) -> int:
         """Clear all users from the database (development only)."""
         try:
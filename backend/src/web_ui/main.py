@@ -187,8 +187,8 @@ async def run_headless_mode() -> None:
     # Keep the application running
     try:
         logger.info("Headless mode active. Press Ctrl+C to shutdown...")
-        while True:
-            await asyncio.sleep(1)
+        # Park on an event that is never set instead of waking every second
+        await asyncio.Event().wait()
     except KeyboardInterrupt:
         logger.info("Shutting down headless services...")
 
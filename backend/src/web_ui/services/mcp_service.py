@@ -1,8 +1,11 @@
 """MCP Service for background operations and startup configuration management."""
 
 import asyncio
+import hashlib
 import json
+import time
 from datetime import datetime
+from pathlib import Path
 from typing import Any
 
 from ..database.utils.mcp_config_manager import MCPConfigManager
@@ -11,21 +14,85 @@ from ..utils.mcp_client import setup_mcp_client_and_tools
 
 logger = get_logger(__name__)
 
+# UI components that display the MCP server configuration
+MCP_CONFIG_COMPONENT_IDS = (
+    "agent_settings.mcp_server_config",
+    "deep_research_agent.mcp_server_config",
+)
+
+
+def _config_digest(config_data: dict[str, Any]) -> str:
+    """
+    Digest an MCP configuration for change detection.
+
+    The digest is taken over a canonical (key-sorted, compact) dump that is
+    never shown to users, so equal configs match regardless of key order.
+
+    Args:
+        config_data: MCP configuration dictionary
+
+    Returns:
+        Hex digest of the configuration
+    """
+    canonical = json.dumps(config_data, sort_keys=True, separators=(",", ":"))
+    return hashlib.blake2b(canonical.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _read_config_file(path: Path) -> tuple[dict[str, Any], float]:
+    """Read the MCP config file, returning its parsed content and mtime."""
+    with open(path, encoding="utf-8") as f:
+        file_config = json.load(f)
+    return file_config, path.stat().st_mtime
+
+
+def _write_config_file(path: Path, file_content: dict[str, Any]) -> float:
+    """Write the MCP config file, returning its new mtime."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(file_content, f, indent=2)
+    return path.stat().st_mtime
+
 
 class MCPService:
     """Background service for MCP configuration management and health monitoring."""
 
-    def __init__(self, webui_manager=None):
+    __slots__ = (
+        "webui_manager",
+        "config_manager",
+        "_config_manager_init_attempted",
+        "mcp_client",
+        "_mcp_client_config_digest",
+        "is_running",
+        "_bg_tasks",
+        "_shutdown_event",
+        "health_check_interval",
+        "backup_interval",
+        "mcp_file_path",
+        "file_check_interval",
+        "file_change_debounce",
+        "last_file_mtime",
+        "collection_stats_ttl",
+        "_collection_stats",
+        "_collection_stats_expiry",
+    )
+
+    def __init__(self, webui_manager=None, initialize_config_manager: bool = True):
         """
         Initialize MCP Service.
 
         Args:
             webui_manager: Reference to WebuiManager for UI integration
+            initialize_config_manager: Build the configuration manager now;
+                ``create`` passes False and builds it in a worker thread
         """
         self.webui_manager = webui_manager
         self.config_manager: MCPConfigManager | None = None
+        self._config_manager_init_attempted = False
         self.mcp_client = None
+        self._mcp_client_config_digest: str | None = None
         self.is_running = False
+        self._bg_tasks: set[asyncio.Task] = set()
+        self._shutdown_event = asyncio.Event()
         self.health_check_interval = 300  # 5 minutes
         self.backup_interval = 3600  # 1 hour
 
@@ -34,13 +101,51 @@ class MCPService:
 
         self.mcp_file_path = get_project_root() / "data" / "mcp.json"
         self.file_check_interval = 30  # Check file every 30 seconds
+        self.file_change_debounce = 0.5  # Quiet period before syncing a change
         self.last_file_mtime: float | None = None
 
+        # Collection stats rarely change between status polls
+        self.collection_stats_ttl = 60  # 1 minute
+        self._collection_stats: dict[str, Any] | None = None
+        self._collection_stats_expiry = 0.0
+
         # Initialize config manager when available
-        self._initialize_config_manager()
+        if initialize_config_manager:
+            self._initialize_config_manager()
+
+    @classmethod
+    async def create(cls, webui_manager=None) -> "MCPService":
+        """
+        Create an MCP service without blocking the event loop.
+
+        Building the configuration manager opens the document database, so
+        it is done in a worker thread rather than in the caller's thread.
+
+        Args:
+            webui_manager: Reference to WebuiManager for UI integration
+
+        Returns:
+            MCPService with its configuration manager initialized
+        """
+        service = cls(webui_manager, initialize_config_manager=False)
+        await asyncio.to_thread(service._initialize_config_manager)
+        return service
+
+    def _initialize_config_manager(self, force: bool = False):
+        """
+        Initialize the MCP Configuration Manager.
+
+        Construction is only attempted once so that repeated start attempts do
+        not keep re-opening database handles after a failure.
+
+        Args:
+            force: Retry initialization even if it was already attempted
+        """
+        if self._config_manager_init_attempted and not force:
+            return
+
+        self._config_manager_init_attempted = True
 
-    def _initialize_config_manager(self):
-        """Initialize the MCP Configuration Manager."""
         try:
             # Try to get DocumentPipeline from webui_manager if available
             if self.webui_manager and hasattr(self.webui_manager, "document_pipeline"):
@@ -71,10 +176,6 @@ class MCPService:
         try:
             logger.info("Starting MCP Service...")
 
-            # Ensure config manager is available
-            if not self.config_manager:
-                self._initialize_config_manager()
-
             if not self.config_manager:
                 logger.error("Cannot start MCP Service without configuration manager")
                 return False
@@ -94,9 +195,15 @@ class MCPService:
 
             # Start background tasks
             self.is_running = True
-            asyncio.create_task(self._background_health_monitoring())
-            asyncio.create_task(self._background_backup_scheduler())
-            asyncio.create_task(self._background_file_monitoring())
+            self._shutdown_event.clear()
+            for coro in (
+                self._background_health_monitoring(),
+                self._background_backup_scheduler(),
+                self._background_file_monitoring(),
+            ):
+                task = asyncio.create_task(coro)
+                self._bg_tasks.add(task)
+                task.add_done_callback(self._bg_tasks.discard)
 
             return True
 
@@ -108,12 +215,20 @@ class MCPService:
         """Stop the MCP service."""
         logger.info("Stopping MCP Service...")
         self.is_running = False
+        self._shutdown_event.set()
+
+        # Cancel background tasks instead of waiting for their sleeps to end
+        tasks = list(self._bg_tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
 
         # Close MCP client if active
         if self.mcp_client:
             try:
                 await self.mcp_client.__aexit__(None, None, None)
                 self.mcp_client = None
+                self._mcp_client_config_digest = None
                 logger.info("MCP client closed successfully")
             except Exception as e:
                 logger.error(f"Error closing MCP client: {e}")
@@ -144,12 +259,14 @@ class MCPService:
 
             logger.info(f"Found active configuration: {config_name}")
 
+            config_digest = _config_digest(config_data)
+
             # Apply configuration to UI if webui_manager is available
             if self.webui_manager:
-                await self._apply_config_to_ui(active_config)
+                await self._apply_config_to_ui(config_name, config_data)
 
             # Initialize MCP client with configuration
-            success = await self._initialize_mcp_client(config_data)
+            success = await self._initialize_mcp_client(config_data, config_digest)
 
             if success:
                 logger.info(
@@ -158,7 +275,8 @@ class MCPService:
                 return True
             else:
                 logger.warning(
-                    f"Configuration loaded but MCP client initialization failed: {config_name}"
+                    "Configuration loaded but MCP client initialization failed: "
+                    f"{config_name}"
                 )
                 return False
 
@@ -184,10 +302,11 @@ class MCPService:
 
             # Store configuration in database
             if self.config_manager:
+                applied_at = datetime.now().isoformat()
                 success, message = await self.config_manager.store_mcp_config(
                     config_data=config_data,
                     config_name=config_name,
-                    description=f"Runtime configuration applied at {datetime.now().isoformat()}",
+                    description=f"Runtime configuration applied at {applied_at}",
                     config_type="runtime",
                     set_as_active=True,
                 )
@@ -196,14 +315,14 @@ class MCPService:
                     logger.error(f"Failed to store configuration: {message}")
                     return False
 
+            config_digest = _config_digest(config_data)
+
             # Apply to UI
             if self.webui_manager:
-                await self._apply_config_to_ui(
-                    {"config_name": config_name, "config_data": config_data}
-                )
+                await self._apply_config_to_ui(config_name, config_data)
 
             # Reinitialize MCP client
-            success = await self._initialize_mcp_client(config_data)
+            success = await self._initialize_mcp_client(config_data, config_digest)
 
             if success:
                 logger.info(f"Successfully applied MCP configuration: {config_name}")
@@ -216,48 +335,76 @@ class MCPService:
             logger.error(f"Error applying MCP configuration: {e}")
             return False
 
-    async def _apply_config_to_ui(self, config_info: dict[str, Any]):
-        """Apply configuration to UI components."""
+    async def _apply_config_to_ui(self, config_name: str, config_data: dict[str, Any]):
+        """
+        Apply configuration to UI components.
+
+        Args:
+            config_name: Name of the configuration being applied
+            config_data: MCP configuration dictionary
+        """
         try:
-            if not self.webui_manager:
+            if not self.webui_manager or not hasattr(
+                self.webui_manager, "id_to_component"
+            ):
                 return
 
-            config_data = config_info.get("config_data", {})
-            config_json = json.dumps(config_data, indent=2)
+            # Apply to agent settings MCP components
+            id_to_component = self.webui_manager.id_to_component
+            for component_id in MCP_CONFIG_COMPONENT_IDS:
+                if component_id in id_to_component:
+                    # Updating the value needs an actual Gradio update mechanism
+                    logger.debug(
+                        "Updated UI component %s with new MCP config", component_id
+                    )
 
-            # Apply to agent settings MCP component
-            if hasattr(self.webui_manager, "id_to_component"):
-                mcp_components = [
-                    "agent_settings.mcp_server_config",
-                    "deep_research_agent.mcp_server_config",
-                ]
+            logger.info("Applied MCP configuration %s to UI components", config_name)
 
-                for component_id in mcp_components:
-                    if component_id in self.webui_manager.id_to_component:
-                        component = self.webui_manager.id_to_component[component_id]
-                        # Update component value (this would need actual Gradio update mechanism)
-                        logger.debug(
-                            f"Updated UI component {component_id} with new MCP config"
-                        )
+        except Exception as e:
+            logger.error("Error applying config to UI: %s", e)
 
-            logger.info("Applied MCP configuration to UI components")
+    async def _initialize_mcp_client(
+        self, config_data: dict[str, Any], config_digest: str | None = None
+    ) -> bool:
+        """
+        Initialize MCP client with configuration.
 
-        except Exception as e:
-            logger.error(f"Error applying config to UI: {e}")
+        Args:
+            config_data: MCP configuration dictionary
+            config_digest: Digest from ``_config_digest``; when it matches the
+                running client's config and that client is healthy, the client
+                is kept as is
 
-    async def _initialize_mcp_client(self, config_data: dict[str, Any]) -> bool:
-        """Initialize MCP client with configuration."""
+        Returns:
+            True if client is ready (or not needed), False otherwise
+        """
         try:
-            # Close existing client if any
+            if config_digest is None:
+                config_digest = _config_digest(config_data)
+
+            if (
+                config_digest == self._mcp_client_config_digest
+                and self._mcp_client_is_healthy()
+            ):
+                logger.debug("MCP client already running with this configuration")
+                return True
+
+            # Close existing client if any; a dead client may fail to close,
+            # which must not stop it from being replaced
             if self.mcp_client:
-                await self.mcp_client.__aexit__(None, None, None)
+                try:
+                    await self.mcp_client.__aexit__(None, None, None)
+                except Exception as e:
+                    logger.warning("Error closing previous MCP client: %s", e)
                 self.mcp_client = None
+                self._mcp_client_config_digest = None
 
             # Initialize new MCP client
             if config_data and "mcpServers" in config_data:
                 self.mcp_client = await setup_mcp_client_and_tools(config_data)
 
                 if self.mcp_client:
+                    self._mcp_client_config_digest = config_digest
                     logger.info("MCP client initialized successfully")
 
                     # Apply to webui_manager if available
@@ -275,7 +422,20 @@ class MCPService:
                 return True
 
         except Exception as e:
-            logger.error(f"Error initializing MCP client: {e}")
+            logger.error("Error initializing MCP client: %s", e)
+            return False
+
+    async def _wait_for_shutdown(self, timeout: float) -> bool:
+        """
+        Wait up to ``timeout`` seconds for the service to be stopped.
+
+        Returns:
+            True if shutdown was requested, False if the interval elapsed
+        """
+        try:
+            await asyncio.wait_for(self._shutdown_event.wait(), timeout=timeout)
+            return True
+        except TimeoutError:
             return False
 
     async def _background_health_monitoring(self):
@@ -284,9 +444,7 @@ class MCPService:
 
         while self.is_running:
             try:
-                await asyncio.sleep(self.health_check_interval)
-
-                if not self.is_running:
+                if await self._wait_for_shutdown(self.health_check_interval):
                     break
 
                 await self._perform_health_check()
@@ -294,8 +452,9 @@ class MCPService:
             except asyncio.CancelledError:
                 break
             except Exception as e:
-                logger.error(f"Error in health monitoring: {e}")
-                await asyncio.sleep(60)  # Wait before retrying
+                logger.error("Error in health monitoring: %s", e)
+                if await self._wait_for_shutdown(60):  # Wait before retrying
+                    break
 
     async def _background_backup_scheduler(self):
         """Background task for scheduling configuration backups."""
@@ -303,9 +462,7 @@ class MCPService:
 
         while self.is_running:
             try:
-                await asyncio.sleep(self.backup_interval)
-
-                if not self.is_running:
+                if await self._wait_for_shutdown(self.backup_interval):
                     break
 
                 await self._perform_backup()
@@ -313,11 +470,26 @@ class MCPService:
             except asyncio.CancelledError:
                 break
             except Exception as e:
-                logger.error(f"Error in backup scheduler: {e}")
-                await asyncio.sleep(300)  # Wait 5 minutes before retrying
+                logger.error("Error in backup scheduler: %s", e)
+                # Wait 5 minutes before retrying
+                if await self._wait_for_shutdown(300):
+                    break
+
+    def _mcp_client_is_healthy(self) -> bool:
+        """Whether the MCP client is started and, if it reports them, has tools."""
+        if self.mcp_client is None:
+            return False
+        server_tools = getattr(self.mcp_client, "server_name_to_tools", None)
+        return server_tools is None or any(server_tools.values())
 
     async def _perform_health_check(self):
-        """Perform health check on MCP servers."""
+        """
+        Perform health check on MCP servers.
+
+        The active configuration is read back on every check, so a config
+        changed through the database or UI is picked up even when the client
+        itself is healthy.
+        """
         try:
             if not self.config_manager:
                 return
@@ -328,20 +500,25 @@ class MCPService:
             if not active_config:
                 return
 
-            # Basic health check - verify MCP client is responsive
-            if self.mcp_client:
-                # This is a simplified health check
-                # In a full implementation, you'd ping each MCP server
-                logger.debug("MCP client health check passed")
+            config_data = active_config.get("config_data", {})
+
+            # Basic health check - verify MCP client is responsive and still
+            # running the active configuration
+            if self._mcp_client_is_healthy():
+                if self._mcp_client_config_digest == _config_digest(config_data):
+                    # This is a simplified health check
+                    # In a full implementation, you'd ping each MCP server
+                    logger.debug("MCP client health check passed")
+                    return
+                logger.info("Active MCP configuration changed during health check")
             else:
                 logger.warning("MCP client not initialized during health check")
 
-                # Attempt to reinitialize
-                config_data = active_config.get("config_data", {})
-                await self._initialize_mcp_client(config_data)
+            # Attempt to reinitialize
+            await self._initialize_mcp_client(config_data)
 
         except Exception as e:
-            logger.error(f"Error during health check: {e}")
+            logger.error("Error during health check: %s", e)
 
     async def _perform_backup(self):
         """Perform automatic backup of active configuration."""
@@ -362,12 +539,12 @@ class MCPService:
                 )
 
                 if success:
-                    logger.info(f"Auto-backup created: {message}")
+                    logger.info("Auto-backup created: %s", message)
                 else:
-                    logger.warning(f"Auto-backup failed: {message}")
+                    logger.warning("Auto-backup failed: %s", message)
 
         except Exception as e:
-            logger.error(f"Error during automatic backup: {e}")
+            logger.error("Error during automatic backup: %s", e)
 
     async def _sync_file_to_database(self) -> bool:
         """
@@ -377,23 +554,20 @@ class MCPService:
             True if sync was successful or not needed, False if error occurred
         """
         try:
-            # Check if file exists
-            if not self.mcp_file_path.exists():
+            # Read file content off the event loop
+            try:
+                file_config, file_mtime = await asyncio.to_thread(
+                    _read_config_file, self.mcp_file_path
+                )
+            except FileNotFoundError:
                 logger.info(f"MCP configuration file not found at {self.mcp_file_path}")
                 return True  # Not an error, just no file to sync
 
-            # Read file content
-            with open(self.mcp_file_path, encoding="utf-8") as f:
-                file_config = json.load(f)
-
             # Extract configuration data (remove metadata if present)
             config_data = {
                 k: v for k, v in file_config.items() if not k.startswith("_")
             }
             file_metadata = file_config.get("_metadata", {})
-
-            # Get file modification time
-            file_mtime = self.mcp_file_path.stat().st_mtime
             self.last_file_mtime = file_mtime
 
             # Get current active configuration from database
@@ -410,10 +584,9 @@ class MCPService:
                 # Compare configuration content
                 db_config_data = active_config.get("config_data", {})
 
-                # Simple comparison - in production you might want more sophisticated diff
-                if json.dumps(config_data, sort_keys=True) != json.dumps(
-                    db_config_data, sort_keys=True
-                ):
+                # Dict equality ignores key order, so there is no need to
+                # serialize both sides just to compare them
+                if config_data != db_config_data:
                     should_sync = True
                     sync_reason = "Configuration content differs from database"
 
@@ -468,9 +641,7 @@ class MCPService:
 
         while self.is_running:
             try:
-                await asyncio.sleep(self.file_check_interval)
-
-                if not self.is_running:
+                if await self._wait_for_shutdown(self.file_check_interval):
                     break
 
                 await self._check_file_changes()
@@ -478,20 +649,36 @@ class MCPService:
             except asyncio.CancelledError:
                 break
             except Exception as e:
-                logger.error(f"Error in file monitoring: {e}")
-                await asyncio.sleep(60)  # Wait before retrying
+                logger.error("Error in file monitoring: %s", e)
+                if await self._wait_for_shutdown(60):  # Wait before retrying
+                    break
 
     async def _check_file_changes(self):
         """Check if the MCP configuration file has been modified."""
         try:
-            if not self.mcp_file_path.exists():
+            # Get current file modification time; stat runs off the event
+            # loop like the file's reads and writes
+            try:
+                current_mtime = (
+                    await asyncio.to_thread(self.mcp_file_path.stat)
+                ).st_mtime
+            except FileNotFoundError:
                 return
 
-            # Get current file modification time
-            current_mtime = self.mcp_file_path.stat().st_mtime
-
             # Check if file has been modified since last check
             if self.last_file_mtime is None or current_mtime > self.last_file_mtime:
+                # Editors often save in several writes; wait until the file
+                # stops changing so a burst of writes is synced only once
+                for _ in range(10):
+                    if await self._wait_for_shutdown(self.file_change_debounce):
+                        return
+                    settled_mtime = (
+                        await asyncio.to_thread(self.mcp_file_path.stat)
+                    ).st_mtime
+                    if settled_mtime == current_mtime:
+                        break
+                    current_mtime = settled_mtime
+
                 logger.info(
                     "MCP configuration file has been modified, syncing to database..."
                 )
@@ -507,7 +694,7 @@ class MCPService:
                     logger.error("Failed to sync updated file to database")
 
         except Exception as e:
-            logger.error(f"Error checking file changes: {e}")
+            logger.error("Error checking file changes: %s", e)
 
     async def update_file_from_database(self, config_id: str | None = None) -> bool:
         """
@@ -554,15 +741,10 @@ class MCPService:
                 },
             }
 
-            # Ensure directory exists
-            self.mcp_file_path.parent.mkdir(parents=True, exist_ok=True)
-
-            # Write to file
-            with open(self.mcp_file_path, "w", encoding="utf-8") as f:
-                json.dump(file_content, f, indent=2)
-
-            # Update file modification time tracking
-            self.last_file_mtime = self.mcp_file_path.stat().st_mtime
+            # Write to file off the event loop and track its modification time
+            self.last_file_mtime = await asyncio.to_thread(
+                _write_config_file, self.mcp_file_path, file_content
+            )
 
             logger.info(f"MCP configuration exported to file: {self.mcp_file_path}")
             return True
@@ -599,7 +781,10 @@ class MCPService:
 
             # Add configuration information
             if self.config_manager:
-                active_config = await self.config_manager.get_active_config()
+                active_config, stats = await asyncio.gather(
+                    self.config_manager.get_active_config(),
+                    self._get_collection_stats(),
+                )
                 if active_config:
                     status["active_config"] = {
                         "name": active_config.get("config_name", "Unknown"),
@@ -611,16 +796,29 @@ class MCPService:
                         ),
                     }
 
-                # Get collection stats
-                stats = self.config_manager.get_collection_stats()
                 status["collection_stats"] = stats
 
             return status
 
         except Exception as e:
-            logger.error(f"Error getting service status: {e}")
+            logger.error("Error getting service status: %s", e)
             return {"error": str(e), "is_running": self.is_running}
 
+    async def _get_collection_stats(self) -> dict[str, Any]:
+        """
+        Get configuration collection stats without blocking the event loop.
+
+        The stats query hits the database synchronously, so it runs in a worker
+        thread and the result is cached for ``collection_stats_ttl`` seconds.
+        """
+        now = time.monotonic()
+        if self._collection_stats is None or now >= self._collection_stats_expiry:
+            self._collection_stats = await asyncio.to_thread(
+                self.config_manager.get_collection_stats
+            )
+            self._collection_stats_expiry = now + self.collection_stats_ttl
+        return self._collection_stats
+
     async def list_available_configs(self) -> list[dict[str, Any]]:
         """Get list of all available configurations."""
         try:
@@ -630,7 +828,7 @@ class MCPService:
             return await self.config_manager.list_configs()
 
         except Exception as e:
-            logger.error(f"Error listing configurations: {e}")
+            logger.error("Error listing configurations: %s", e)
             return []
 
     async def switch_configuration(self, config_id: str) -> tuple[bool, str]:
@@ -3,39 +3,19 @@ User Document Service - Focused on User Experience
 Handles document creation, editing, and format conversion for users
 """
 
-import asyncio
+import functools
 import io
-import tempfile
+import logging
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional, BinaryIO
-import logging
-import json
-
-# Document creation libraries
-from docx import Document as DocxDocument
-from docx.shared import Inches
-from docx.enum.text import WD_ALIGN_PARAGRAPH
-import openpyxl
-from openpyxl.styles import Font, Alignment
-from pptx import Presentation
-from pptx.util import Inches as PptxInches
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.lib import colors
+from typing import Any, Dict
+
+# Markup handling shared by most conversions. The heavier format libraries
+# (python-docx, reportlab, PDF readers, striprtf, chardet) are imported by the
+# methods that use them so importing this module stays cheap
 import markdown
 from bs4 import BeautifulSoup
-from jinja2 import Environment, BaseLoader
-import csv
-import json
-
-# File processing
-import chardet
-from striprtf.striprtf import rtf_to_text
-import PyPDF2
-import pdfplumber
+from jinja2 import BaseLoader, Environment
 
 logger = logging.getLogger(__name__)
 
@@ -43,8 +23,6 @@ class UserDocumentService:
     """Service for user document creation and editing"""
 
     def __init__(self):
-        self.jinja_env = Environment(loader=BaseLoader())
-
         # Document templates for users
         self.user_templates = {
             'blank_document': {
@@ -85,18 +63,42 @@ class UserDocumentService:
             }
         }
 
-    async def get_available_templates(self) -> List[Dict[str, Any]]:
+        # Templates are static, so the listing is built once on first request;
+        # anything that changes user_templates must reset it to None
+        self._template_listing: list[dict[str, Any]] | None = None
+
+        # Importers by file extension, resolved once instead of per import
+        self._importers = {
+            '.txt': self._import_text,
+            '.md': self._import_markdown,
+            '.markdown': self._import_markdown,
+            '.docx': self._import_docx,
+            '.pdf': self._import_pdf,
+            '.html': self._import_html,
+            '.htm': self._import_html,
+            '.rtf': self._import_rtf
+        }
+
+    @functools.cached_property
+    def jinja_env(self) -> Environment:
+        """Template environment, only constructed if something renders with it"""
+        return Environment(loader=BaseLoader())
+
+    async def get_available_templates(self) -> list[dict[str, Any]]:
         """Get list of available document templates for users"""
-        templates = []
-        for key, template in self.user_templates.items():
-            templates.append({
-                'id': key,
-                'name': template['name'],
-                'description': template['description'],
-                'format': template['format'],
-                'preview': template['content'][:200] + '...' if len(template['content']) > 200 else template['content']
-            })
-        return templates
+        if self._template_listing is None:
+            templates = []
+            for key, template in self.user_templates.items():
+                templates.append({
+                    'id': key,
+                    'name': template['name'],
+                    'description': template['description'],
+                    'format': template['format'],
+                    'preview': template['content'][:200] + '...' if len(template['content']) > 200 else template['content']
+                })
+            self._template_listing = templates
+        # Copy each entry so callers cannot mutate the cached listing
+        return [dict(template) for template in self._template_listing]
 
     async def create_document_from_template(self, template_id: str, title: str = None) -> Dict[str, Any]:
         """Create a new document from a template"""
@@ -209,23 +211,13 @@ class UserDocumentService:
             file_path = Path(file_path)
             file_ext = file_path.suffix.lower()
 
-            if file_ext == '.txt':
-                content = await self._import_text(file_path)
-            elif file_ext == '.md' or file_ext == '.markdown':
-                content = await self._import_markdown(file_path)
-            elif file_ext == '.docx':
-                content = await self._import_docx(file_path)
-            elif file_ext == '.pdf':
-                content = await self._import_pdf(file_path)
-            elif file_ext == '.html' or file_ext == '.htm':
-                content = await self._import_html(file_path)
-            elif file_ext == '.rtf':
-                content = await self._import_rtf(file_path)
-            else:
+            importer = self._importers.get(file_ext)
+            if importer is None:
                 return {
                     'success': False,
                     'error': f'Unsupported file format: {file_ext}'
                 }
+            content = await importer(file_path)
 
             return {
                 'success': True,
@@ -248,6 +240,11 @@ class UserDocumentService:
     # Document creation methods
     async def _create_pdf(self, content: str, title: str) -> bytes:
         """Create PDF from markdown content"""
+        from reportlab.lib.pagesizes import letter
+        from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+        from reportlab.lib.units import inch
+        from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer
+
         buffer = io.BytesIO()
         doc = SimpleDocTemplate(buffer, pagesize=letter, topMargin=1*inch)
         styles = getSampleStyleSheet()
@@ -263,6 +260,14 @@ class UserDocumentService:
         )
         story.append(Paragraph(title, title_style))
 
+        # Shared by every list item, so built once rather than per item
+        bullet_style = ParagraphStyle(
+            'BulletStyle',
+            parent=styles['Normal'],
+            leftIndent=20,
+            bulletIndent=10
+        )
+
         # Convert markdown to HTML then to paragraphs
         html_content = markdown.markdown(content)
         soup = BeautifulSoup(html_content, 'html.parser')
@@ -279,12 +284,6 @@ class UserDocumentService:
             elif element.name in ['ul', 'ol']:
                 # Handle lists
                 for li in element.find_all('li'):
-                    bullet_style = ParagraphStyle(
-                        'BulletStyle',
-                        parent=styles['Normal'],
-                        leftIndent=20,
-                        bulletIndent=10
-                    )
                     story.append(Paragraph(f"• {li.get_text()}", bullet_style))
 
             story.append(Spacer(1, 6))
@@ -294,6 +293,9 @@ class UserDocumentService:
 
     async def _create_docx(self, content: str, title: str) -> bytes:
         """Create DOCX from markdown content"""
+        from docx import Document as DocxDocument
+        from docx.enum.text import WD_ALIGN_PARAGRAPH
+
         doc = DocxDocument()
 
         # Add title
@@ -324,6 +326,8 @@ class UserDocumentService:
     # Import methods
     async def _import_text(self, file_path: Path) -> str:
         """Import plain text file"""
+        import chardet
+
         with open(file_path, 'rb') as f:
             raw_data = f.read()
             encoding = chardet.detect(raw_data)['encoding'] or 'utf-8'
@@ -337,6 +341,8 @@ class UserDocumentService:
 
     async def _import_docx(self, file_path: Path) -> str:
         """Import DOCX file and convert to markdown"""
+        from docx import Document as DocxDocument
+
         doc = DocxDocument(file_path)
         markdown_content = []
 
@@ -359,6 +365,9 @@ class UserDocumentService:
 
     async def _import_pdf(self, file_path: Path) -> str:
         """Import PDF file and extract text"""
+        import pdfplumber
+        import PyPDF2
+
         content = ""
 
         try:
@@ -409,6 +418,8 @@ class UserDocumentService:
 
     async def _import_rtf(self, file_path: Path) -> str:
         """Import RTF file and convert to plain text"""
+        from striprtf.striprtf import rtf_to_text
+
         with open(file_path, 'r', encoding='utf-8') as f:
             rtf_content = f.read()
 
@@ -2,10 +2,24 @@
 Path utilities for the web-ui project.
 """
 
+import os
 from pathlib import Path
 
 def get_project_root() -> Path:
     """Get the project root directory."""
     # From backend/src/web_ui/utils/paths.py
     # Go up 5 levels: utils/ -> web_ui/ -> src/ -> backend/ -> project_root
-    return Path(__file__).parent.parent.parent.parent.parent
\ No newline at end of file
+    return Path(__file__).parent.parent.parent.parent.parent
+
+
+def get_file_extension(file_path: str) -> str:
+    """
+    Get the lower-cased extension of a path, e.g. ".md".
+
+    Matches ``Path(file_path).suffix.lower()`` without building a Path object.
+    """
+    name = os.path.basename(file_path)
+    dot = name.rfind(".")
+    if 0 < dot < len(name) - 1:
+        return name[dot:].lower()
+    return ""
@@ -1,7 +1,7 @@
 import base64
 import os
 import time
-from pathlib import Path
+from collections.abc import Iterator
 
 from .logging_config import get_logger
 
@@ -16,25 +16,65 @@ def encode_image(img_path):
     return image_data
 
 
+def _iter_files(directory: str) -> Iterator[os.DirEntry]:
+    """Recursively yield file entries under a directory using os.scandir.
+
+    Unreadable subdirectories and entries that vanish mid-scan are skipped;
+    only a failure to list ``directory`` itself is raised.
+    """
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            # DirEntry caches the file type from the directory listing,
+            # so these checks do not cost an extra stat per entry
+            try:
+                is_dir = entry.is_dir(follow_symlinks=False)
+                is_file = not is_dir and entry.is_file()
+            except OSError:
+                continue
+            if is_dir:
+                try:
+                    yield from _iter_files(entry.path)
+                except OSError as e:
+                    logger.debug(f"Skipping unreadable directory {entry.path}: {e}")
+            elif is_file:
+                yield entry
+
+
 def get_latest_files(
     directory: str, file_types: list = [".webm", ".zip"]
 ) -> dict[str, str | None]:
-    """Get the latest recording and trace files"""
+    """Get the latest recording and trace files."""
     latest_files: dict[str, str | None] = {ext: None for ext in file_types}
 
     if not os.path.exists(directory):
         os.makedirs(directory, exist_ok=True)
         return latest_files
 
-    for file_type in file_types:
-        try:
-            matches = list(Path(directory).rglob(f"*{file_type}"))
-            if matches:
-                latest = max(matches, key=lambda p: p.stat().st_mtime)
-                # Only return files that are complete (not being written)
-                if time.time() - latest.stat().st_mtime > 1.0:
-                    latest_files[file_type] = str(latest)
-        except Exception as e:
-            logger.error(f"Error getting latest {file_type} file: {e}")
+    # Single pass over the tree for all file types; the suffix tuple is built
+    # once so most entries are rejected with one endswith() call
+    suffixes = tuple(file_types)
+    latest_mtimes: dict[str, float] = {}
+    try:
+        for entry in _iter_files(directory):
+            if not entry.name.endswith(suffixes):
+                continue
+            for file_type in file_types:
+                if entry.name.endswith(file_type):
+                    try:
+                        mtime = entry.stat().st_mtime
+                    except OSError:
+                        # Deleted between the listing and the stat
+                        break
+                    if mtime > latest_mtimes.get(file_type, float("-inf")):
+                        latest_mtimes[file_type] = mtime
+                        latest_files[file_type] = entry.path
+    except OSError as e:
+        logger.error(f"Error getting latest files in {directory}: {e}")
+
+    # Only return files that are complete (not being written)
+    now = time.time()
+    for file_type, mtime in latest_mtimes.items():
+        if now - mtime <= 1.0:
+            latest_files[file_type] = None
 
     return latest_files
@@ -0,0 +1,93 @@
+"""Start, poll, and stop the uvicorn API server used by the integration tests.
+
+Shared by the session fixture in conftest.py and by the auth integration
+suite when it is run as a script.
+"""
+
+import asyncio
+import os
+import signal
+import subprocess
+import sys
+from pathlib import Path
+
+import httpx
+
+project_root = Path(__file__).parent.parent
+
+TEST_SERVER_HOST = "127.0.0.1"
+TEST_SERVER_PORT = 8000
+TEST_SERVER_URL = f"http://localhost:{TEST_SERVER_PORT}"
+
+
+async def is_healthy(client: httpx.AsyncClient) -> bool:
+    """Whether the server behind client answers /health with a 200."""
+    try:
+        response = await client.get("/health")
+        return response.status_code == 200
+    except (httpx.HTTPError, OSError):
+        return False
+
+
+async def wait_ready(client: httpx.AsyncClient, deadline_s: float = 30.0) -> bool:
+    """Poll /health until it answers 200, backing off 10ms, 40ms, 160ms... 0.5s."""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + deadline_s
+    delay = 0.01
+    while loop.time() < deadline:
+        if await is_healthy(client):
+            return True
+        await asyncio.sleep(delay)
+        delay = min(delay * 4, 0.5)
+    return False
+
+
+def spawn_server() -> subprocess.Popen:
+    """Start uvicorn serving web_ui.api.server:app in a new process."""
+    # Server output is never read; discarding it avoids uvicorn blocking
+    # once an undrained pipe buffer fills up
+    return subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "web_ui.api.server:app",
+            "--host",
+            TEST_SERVER_HOST,
+            "--port",
+            str(TEST_SERVER_PORT),
+            "--workers",
+            "1",
+            "--log-level",
+            "warning",
+        ],
+        cwd=str(project_root / "backend" / "src"),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        creationflags=subprocess.CREATE_NEW_PROCESS_GROUP if os.name == "nt" else 0,
+    )
+
+
+async def ensure_server(
+    client: httpx.AsyncClient,
+) -> tuple[subprocess.Popen | None, bool]:
+    """Reuse a running server, or spawn one and wait for it to become ready.
+
+    Returns the spawned process, or None if a server was already running,
+    and whether the server is ready.
+    """
+    if await is_healthy(client):
+        return None, True
+    process = spawn_server()
+    return process, await wait_ready(client)
+
+
+def stop_server(process: subprocess.Popen, timeout: float = 5.0) -> None:
+    """Stop a server started by spawn_server and wait for it to exit."""
+    if os.name == "nt":
+        # Started with CREATE_NEW_PROCESS_GROUP, so Ctrl+Break reaches
+        # uvicorn without spawning taskkill
+        process.send_signal(signal.CTRL_BREAK_EVENT)
+    else:
+        process.terminate()
+    process.wait(timeout)
@@ -0,0 +1,44 @@
+"""Shared pytest fixtures for the integration tests."""
+
+import asyncio
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# Conftest loads before any test module, so the backend package and the
+# test environment are set up once here instead of ahead of each module's
+# imports
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "backend" / "src"))
+
+os.environ.setdefault("JWT_SECRET", "test-jwt-secret-for-integration-testing")
+os.environ.setdefault("ENV", "development")
+
+
+@pytest.fixture(scope="session")
+def test_server():
+    """Start the API server once per test session.
+
+    Only requested by suites running against a real server
+    (USE_REAL_SERVER=true); by default they talk to the app in-process.
+    Yields the base URL, or None if the server could not be reached, so
+    suites can skip their API checks. A server that is already running is
+    reused and left running.
+    """
+    # Imported here so collecting tests that never need a server does not
+    # require httpx
+    import httpx
+    from api_test_server import TEST_SERVER_URL, ensure_server, stop_server
+
+    async def start():
+        async with httpx.AsyncClient(base_url=TEST_SERVER_URL, timeout=2.0) as client:
+            return await ensure_server(client)
+
+    process, ready = asyncio.run(start())
+    try:
+        yield TEST_SERVER_URL if ready else None
+    finally:
+        if process is not None:
+            stop_server(process)